@@ -14,6 +14,7 @@ from load_atoms.database.database_entry import (
     LICENSE_URLS,
     DatabaseEntry,
     PropertyDescription,
+    YamlLoader,
 )
 from load_atoms.utils import lpad
 
@@ -385,7 +386,7 @@ def get_info(dataset_name: str) -> ComputedInfo:
         return compute_info(dataset)
     else:
         with open(_INFO_DIR / f"{dataset_name}-computed.yaml") as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlLoader)
 
 
 def info_table(entries: list[DatabaseEntry]) -> str:
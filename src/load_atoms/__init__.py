@@ -3,7 +3,6 @@ from __future__ import annotations
 from pathlib import Path
 
 import ase
-from ase.io import read
 
 from load_atoms.utils import remove_calculator
 
@@ -103,6 +102,9 @@ def load_dataset(
     if Path(thing).exists() and Path(thing).is_file():
         # thing is a string/path to a file that exists
         # assume it is a file containing structures and load them
+        # ase.io is slow to import: only pay for it when reading a file
+        from ase.io import read
+
         structures = read(Path(thing), index=":")
         if isinstance(structures, ase.Atoms):
             structures = [structures]
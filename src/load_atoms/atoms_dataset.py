@@ -18,7 +18,6 @@ from typing import (
 )
 
 import ase
-import ase.io
 import lmdb
 import numpy as np
 from ase import Atoms
@@ -146,15 +145,18 @@ class AtomsDataset(ABC, Sequence[Atoms]):
             return self._index_subset(idxs)
 
         if isinstance(index, list):
-            if all(isinstance(i, bool) for i in index):
-                if len(index) != len(self):
-                    raise ValueError(
-                        "Boolean index list must be the same length as the "
-                        "dataset."
-                    )
-                return self._index_subset([i for i, b in enumerate(index) if b])
-            else:
-                return self._index_subset(index)
+            if not index or isinstance(index[0], bool):
+                # (probably) a boolean mask: a single conversion, in C, both
+                # checks that every element is a bool and gives us the mask
+                mask = np.asarray(index)
+                if mask.dtype == bool or not index:
+                    if len(index) != len(self):
+                        raise ValueError(
+                            "Boolean index list must be the same length as "
+                            "the dataset."
+                        )
+                    return self._index_subset(np.flatnonzero(mask))
+            return self._index_subset(index)
 
         if isinstance(index, np.ndarray):
             return self._index_subset(np.arange(len(self))[index])
@@ -237,6 +239,8 @@ class AtomsDataset(ABC, Sequence[Atoms]):
         kwargs
             Additional keyword arguments to pass to :func:`ase.io.write`.
         """
+        import ase.io
+
         ase.io.write(
             path,
             self,
@@ -382,16 +386,25 @@ class AtomsDataset(ABC, Sequence[Atoms]):
                     per structure: (config_type, detailed_ct, split, energy)
         """
 
+        info_items = tuple(info_kwargs.items())
+
         def matches_info(structure: ase.Atoms) -> bool:
-            for key, value in info_kwargs.items():
-                if structure.info.get(key, None) != value:
+            info = structure.info
+            for key, value in info_items:
+                if info.get(key, None) != value:
                     return False
             return True
 
-        functions = (*functions, matches_info)
+        # skip info checks that would always pass
+        checks = (*functions, matches_info) if info_items else functions
+
+        if len(checks) == 1:
+            # the common case: avoid building a generator for every structure
+            the_filter = checks[0]
+        else:
 
-        def the_filter(structure: ase.Atoms) -> bool:
-            return all(f(structure) for f in functions)
+            def the_filter(structure: ase.Atoms) -> bool:
+                return all(check(structure) for check in checks)
 
         index = [i for i, structure in enumerate(self) if the_filter(structure)]
         return self[index]
@@ -609,6 +622,7 @@ class InMemoryAtomsDataset(AtomsDataset):
         self._structures = structures
         self._info = _get_info_mapping(structures)
         self._arrays = _get_arrays_mapping(structures)
+        self._structure_sizes: np.ndarray | None = None
 
     @property
     @override
@@ -623,7 +637,14 @@ class InMemoryAtomsDataset(AtomsDataset):
     @property
     @override
     def structure_sizes(self) -> np.ndarray:
-        return np.array([len(s) for s in self._structures])
+        # computed once, on first use
+        if self._structure_sizes is None:
+            self._structure_sizes = np.fromiter(
+                (len(s) for s in self._structures),
+                dtype=int,
+                count=len(self._structures),
+            )
+        return self._structure_sizes
 
     @override
     def __len__(self) -> int:
@@ -635,7 +656,14 @@ class InMemoryAtomsDataset(AtomsDataset):
 
     @override
     def _index_subset(self, idxs: Sequence[int]) -> InMemoryAtomsDataset:
-        return InMemoryAtomsDataset([self._index_structure(i) for i in idxs])
+        structures = self._structures
+        subset = InMemoryAtomsDataset([structures[i] for i in idxs])
+        # re-use the sizes of the structures if we already know them
+        if self._structure_sizes is not None:
+            subset._structure_sizes = self._structure_sizes[
+                np.asarray(idxs, dtype=int)
+            ]
+        return subset
 
     @override
     @classmethod
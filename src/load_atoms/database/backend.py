@@ -12,7 +12,6 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Iterator
 
-import ase.io
 from ase import Atoms
 from typing_extensions import override
 
@@ -209,6 +208,8 @@ class SingleFileImporter(BaseImporter):
 
     @classmethod
     def _read_file(cls, file_path: Path) -> Iterator[Atoms]:
+        import ase.io
+
         yield from ase.io.iread(file_path, index=":")
 
 
@@ -1,13 +1,20 @@
 # explicitly not using future annotations since this is not supported
 # by pydantic for python versions we want to target
 
+import re
 from pathlib import Path
 from typing import Dict, Literal, Optional, Union
 
 import yaml
 from pydantic import BaseModel, field_validator
 
-from load_atoms.utils import BASE_REMOTE_URL
+from load_atoms.utils import BASE_REMOTE_URL, cached_on_file_stat
+
+try:
+    # libyaml's C parser is several times faster than the pure-Python one
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
 
 LICENSE_URLS = {
     "CC BY-NC-SA 4.0": "https://creativecommons.org/licenses/by-nc-sa/4.0/deed.en",
@@ -20,6 +27,19 @@ LICENSE_URLS = {
 VALID_LICENSES = list(LICENSE_URLS.keys())
 
 VALID_CATEGORIES = ["Benchmarks", "Potential Fitting", "Synthetic Data"]
+# for membership checks: the (ordered) lists above are used in error messages
+_VALID_CATEGORY_SET = frozenset(VALID_CATEGORIES)
+
+# the start of a BibTeX entry, e.g. "@article{". This is only ever matched
+# against the start of the string, and so never has to scan (or backtrack
+# over) the whole citation
+_BIBTEX_ENTRY_START = re.compile(r"@\w+\s*\{")
+
+
+@cached_on_file_stat(maxsize=64)
+def _load_yaml(path: Union[Path, str]) -> dict:
+    with open(path) as f:
+        return yaml.load(f, Loader=YamlLoader)
 
 
 class PropertyDescription(BaseModel):
@@ -82,7 +102,7 @@ class DatabaseEntry(BaseModel):
 
     @field_validator("category")
     def validate_category(cls, v):
-        if v not in VALID_CATEGORIES:
+        if v not in _VALID_CATEGORY_SET:
             raise ValueError(
                 f"Invalid category: {v}. Must be one of {VALID_CATEGORIES}"
             )
@@ -90,7 +110,7 @@ class DatabaseEntry(BaseModel):
 
     @field_validator("license")
     def validate_license(cls, v):
-        if v not in VALID_LICENSES:
+        if v not in LICENSE_URLS:
             raise ValueError(
                 f"Invalid license: {v}. Must be one of {VALID_LICENSES}"
             )
@@ -99,7 +119,7 @@ class DatabaseEntry(BaseModel):
     @field_validator("citation")
     def validate_citation(cls, v):
         v = v.strip()
-        if v.startswith("@") and v.endswith("}"):
+        if _BIBTEX_ENTRY_START.match(v) and v.endswith("}"):
             return v
         raise ValueError(f"Invalid BibTeX: {v}")
 
@@ -112,11 +132,12 @@ class DatabaseEntry(BaseModel):
     @classmethod
     def from_yaml_file(cls, path: Union[Path, str]) -> "DatabaseEntry":
         path = Path(path).resolve()
-        with open(path) as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml(path)
 
         try:
-            return cls(**data)
+            # validate the parsed mapping directly, without first unpacking
+            # it into keyword arguments
+            return cls.model_validate(data)
         except Exception as e:
             raise ValueError(
                 f"Error loading dataset description from {path}. It may be "
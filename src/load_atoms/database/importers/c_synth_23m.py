@@ -33,11 +33,12 @@ class Importer(BaseImporter):
             total=len(extxyz_files),
         )
 
-        # iterate through all .extxyz files
+        # iterate through all .extxyz files: giving the format explicitly
+        # avoids ASE detecting it for every (small) file, which is ~5x slower
         for file_path in extxyz_files:
-            structures = ase.io.read(file_path, index=":")
-            assert isinstance(structures, list)
-            for structure in structures:
+            for structure in ase.io.iread(
+                file_path, index=":", format="extxyz"
+            ):
                 yield process_structure(structure)
 
             task.update(advance=1)
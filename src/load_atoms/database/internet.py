@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import hashlib
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 
 import requests
 
 from load_atoms.progress import Progress
-from load_atoms.utils import matches_checksum
+from load_atoms.utils import (
+    format_checksum,
+    is_valid_checksum,
+    matches_checksum,
+    parse_checksum,
+)
+
+
+class DownloadCancelled(Exception):
+    """Raised when a download is stopped part-way through."""
 
 
 @dataclass
@@ -17,13 +29,25 @@ class FileDownload:
     local_name: str = None  # type: ignore
 
     def __post_init__(self):
+        # catch malformed hashes now, rather than after a (slow) download
+        if not is_valid_checksum(self.expected_hash):
+            raise ValueError(
+                f"Invalid expected hash for {self.url}: {self.expected_hash!r}"
+            )
         if self.local_name is None:
             self.local_name = Path(self.url).name
 
 
-def download(url: str, local_path: Path, progress: Progress):
+def download(
+    url: str,
+    local_path: Path,
+    progress: Progress,
+    algorithm: str = "sha256",
+    cancelled: threading.Event | None = None,
+) -> str:
     """
-    Download a file from the given url to the given path.
+    Download a file from the given url to the given path, returning its
+    checksum (as per :func:`~load_atoms.utils.generate_checksum`).
 
     If path is a file, the file will be downloaded to that path.
     Else, the file will be downloaded to the given path, with the same name as
@@ -37,22 +61,44 @@ def download(url: str, local_path: Path, progress: Progress):
         The path to download the file to.
     progress
         The progress bar to add the download to.
+    algorithm
+        The :mod:`hashlib` algorithm to generate the checksum with. The file
+        is hashed as it arrives, rather than being read back from disk.
+    cancelled
+        If provided, and set (e.g. from another thread), the download stops
+        after its current chunk with a :class:`DownloadCancelled` error.
     """
 
     if local_path.is_dir():
         local_path = local_path / Path(url).name
     local_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with requests.get(url, stream=True) as response, progress.new_task(
-        f"Downloading {local_path.name}"
-    ) as task, open(local_path, "wb") as f:
-        response.raise_for_status()
-        file_size = int(response.headers["content-length"])
-        task.update(total=file_size)
-        for chunk in response.iter_content(chunk_size=1024):
-            if chunk:
-                f.write(chunk)
-                task.update(advance=len(chunk))
+    hasher = hashlib.new(algorithm)
+
+    created = False
+    try:
+        with requests.get(url, stream=True) as response, progress.new_task(
+            f"Downloading {local_path.name}"
+        ) as task:
+            response.raise_for_status()
+            file_size = int(response.headers["content-length"])
+            task.update(total=file_size)
+            with open(local_path, "wb") as f:
+                created = True
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    if cancelled is not None and cancelled.is_set():
+                        raise DownloadCancelled(url)
+                    if chunk:
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        task.update(advance=len(chunk))
+    except BaseException:
+        # don't leave a partial file behind: it would be mistaken for a
+        # complete download next time
+        if created:
+            local_path.unlink(missing_ok=True)
+        raise
+
+    return format_checksum(hasher)
 
 
 def download_all(
@@ -73,17 +119,77 @@ def download_all(
         A Progress object to track the download progress.
     """
 
-    # 1. download any missing files
-    for file in files:
-        local_path = download_dir / file.local_name
-        if not local_path.exists():
-            download(file.url, local_path, progress)
+    # 1. download any missing files. Each file is hashed as it arrives, so
+    #    that it needn't be read back from disk to verify
+    local_paths = [download_dir / file.local_name for file in files]
+    missing = [
+        (file, path)
+        for file, path in zip(files, local_paths)
+        if not path.exists()
+    ]
+    checksums = _download_missing(missing, progress)
+
+    # 2. verify the hashes of all files: only files that were already on disk
+    #    need hashing now. Hashing releases the GIL, so large files can be
+    #    checked concurrently using threads
+    def verify(file: FileDownload, local_path: Path) -> bool:
+        if local_path in checksums:
+            return (
+                parse_checksum(checksums[local_path])[1]
+                == parse_checksum(file.expected_hash)[1]
+            )
+        return matches_checksum(local_path, file.expected_hash)
+
+    with ThreadPoolExecutor() as pool:
+        matches = list(pool.map(verify, files, local_paths))
 
-    # 2. verify the hashes of all files
-    for file in files:
-        local_path = download_dir / file.local_name
-        if not matches_checksum(local_path, file.expected_hash):
+    for local_path, match in zip(local_paths, matches):
+        if not match:
             warnings.warn(
                 f"Checksum mismatch for file: {local_path}",
                 stacklevel=2,
             )
+
+
+def _download_missing(
+    missing: list[tuple[FileDownload, Path]],
+    progress: Progress,
+) -> dict[Path, str]:
+    """
+    Download each file to its path, returning a mapping from path to checksum.
+
+    Downloading is I/O bound, and so several files are fetched concurrently
+    using threads. The first failure (or a KeyboardInterrupt) stops all
+    downloads promptly: those yet to start are cancelled, and those in
+    progress stop after their current chunk.
+    """
+
+    def algorithm(file: FileDownload) -> str:
+        return parse_checksum(file.expected_hash)[0]
+
+    if len(missing) <= 1 or not progress.supports_concurrent_tasks:
+        return {
+            path: download(file.url, path, progress, algorithm(file))
+            for file, path in missing
+        }
+
+    cancelled = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=4)
+    futures = {
+        pool.submit(
+            download, file.url, path, progress, algorithm(file), cancelled
+        ): path
+        for file, path in missing
+    }
+    try:
+        return {
+            futures[future]: future.result() for future in as_completed(futures)
+        }
+    except BaseException:
+        cancelled.set()
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        # don't block on downloads that are still stopping
+        pool.shutdown(wait=False)
@@ -67,6 +67,11 @@ class Progress(Generic[T], ABC):
         """Return the text as a link."""
         return url
 
+    @property
+    def supports_concurrent_tasks(self) -> bool:
+        """Whether several tasks can be displayed (legibly) at once."""
+        return True
+
 
 def get_progress_for_dataset(dataset_id: str) -> Progress:
     env_verbosity = os.environ.get("LOAD_ATOMS_VERBOSE", "2")
@@ -200,6 +205,11 @@ class PrintedProgressBar(Progress):
         # underline terminal text and make it a link
         return f"\033[4m\033[94m{url}\033[0m"
 
+    @property
+    def supports_concurrent_tasks(self) -> bool:
+        # each task is printed on a single, unfinished line
+        return False
+
 
 class PrintedTask(Task):
     def __init__(self, description: str, total: int | float | None = None):
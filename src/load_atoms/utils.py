@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import functools
 import hashlib
+import mmap
 import os
+import re
 import warnings
 from collections import defaultdict
 from pathlib import Path
-from typing import Callable, Iterable, KeysView, Mapping, Sequence, TypeVar
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Iterable,
+    KeysView,
+    Mapping,
+    Sequence,
+    TypeVar,
+)
 
 import numpy as np
 from ase import Atoms
@@ -24,20 +36,144 @@ def testing() -> bool:
     return "PYTEST_CURRENT_TEST" in os.environ
 
 
-def generate_checksum(file_path: Path | str) -> str:
-    """Generate a checksum for a file."""
+# files up to this size are hashed in a single call; larger files are fed to
+# the hasher in chunks, so that each chunk stays cache-resident
+_ONE_SHOT_CHECKSUM_LIMIT = 128 * 1024 * 1024
+_CHECKSUM_CHUNK_SIZE = 8 * 1024 * 1024
+_DEFAULT_CHECKSUM_ALGORITHM = "sha256"
+# a (possibly algorithm-tagged) checksum, as created by generate_checksum
+_CHECKSUM_PATTERN = re.compile(r"(?:([\w-]+):)?[0-9a-f]{12}")
+# the algorithms that checksums can be tagged with: variable-length (shake_*)
+# digests need a length to be given, and so can't be used
+_CHECKSUM_ALGORITHMS = frozenset(
+    name
+    for name in hashlib.algorithms_available
+    if not name.startswith("shake_")
+)
+
 
-    sha256_hash = hashlib.sha256()
+def _file_hasher(file_path: Path | str, algorithm: str) -> Any:
+    hasher = hashlib.new(algorithm)
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        size = os.fstat(f.fileno()).st_size
+        # mmap-ing an empty file is an error (and there is nothing to hash)
+        if size > 0:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # not every file (system) supports memory-mapping
+                _update_from_file(hasher, f)
+                return hasher
+
+            with mm:
+                if size <= _ONE_SHOT_CHECKSUM_LIMIT:
+                    hasher.update(mm)
+                else:
+                    with memoryview(mm) as view:
+                        for start in range(0, size, _CHECKSUM_CHUNK_SIZE):
+                            hasher.update(
+                                view[start : start + _CHECKSUM_CHUNK_SIZE]
+                            )
+
+    return hasher
+
+
+def _update_from_file(hasher: Any, f: BinaryIO) -> None:
+    """Feed ``hasher`` the (rest of the) contents of the binary file ``f``."""
+    if hasattr(hashlib, "file_digest"):  # python 3.11+
+        hashlib.file_digest(f, lambda: hasher)  # type: ignore
+        return
+
+    # read into a single, re-used buffer
+    buffer = bytearray(_CHECKSUM_CHUNK_SIZE)
+    with memoryview(buffer) as view:
+        while n := f.readinto(buffer):
+            hasher.update(view[:n])
+
+
+def cached_on_file_stat(maxsize: int) -> Callable[[Callable], Callable]:
+    """
+    Cache the results of ``func(path, *args)``, keyed on ``path``'s
+    modification time and size as well as the path itself, so that a file
+    that has changed is never served a stale result.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.lru_cache(maxsize=maxsize)
+        def cached(path: str, mtime_ns: int, size: int, *args):
+            return func(path, *args)
+
+        @functools.wraps(func)
+        def wrapper(path: Path | str, *args):
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            return cached(path, stat.st_mtime_ns, stat.st_size, *args)
+
+        wrapper.cache_clear = cached.cache_clear  # type: ignore
+        return wrapper
+
+    return decorator
+
+
+def generate_checksum(
+    file_path: Path | str, algorithm: str = _DEFAULT_CHECKSUM_ALGORITHM
+) -> str:
+    """
+    Generate a checksum for a file.
+
+    Checksums generated using any :mod:`hashlib` ``algorithm`` other than the
+    default (``"sha256"``) are tagged with the algorithm's name, e.g.
+    ``"blake2b:1a2b3c4d5e6f"``, so that :func:`matches_checksum` knows how to
+    verify them.
+    """
+    return _cached_checksum(file_path, algorithm)
+
 
-    return sha256_hash.hexdigest()[:12]
+@cached_on_file_stat(maxsize=1024)
+def _cached_checksum(path: str, algorithm: str) -> str:
+    return format_checksum(_file_hasher(path, algorithm))
+
+
+def format_checksum(hasher: Any) -> str:
+    """
+    Format the digest of a :mod:`hashlib` ``hasher`` (that has already been fed
+    some data) as a checksum, in the same way as :func:`generate_checksum`.
+    """
+    digest = hasher.hexdigest()[:12]
+    if hasher.name == _DEFAULT_CHECKSUM_ALGORITHM:
+        return digest
+    return f"{hasher.name}:{digest}"
+
+
+def parse_checksum(hash: str) -> tuple[str, str]:
+    """
+    Split a checksum, as generated by :func:`generate_checksum`, into the name
+    of the algorithm used to create it and its (truncated) digest.
+    """
+    algorithm, _, digest = hash.rpartition(":")
+    return algorithm or _DEFAULT_CHECKSUM_ALGORITHM, digest
+
+
+def is_valid_checksum(hash: str) -> bool:
+    """
+    Check if ``hash`` is of the form generated by :func:`generate_checksum`.
+    """
+    if not isinstance(hash, str):
+        return False
+    match = _CHECKSUM_PATTERN.fullmatch(hash)
+    if match is None:
+        return False
+    algorithm = match.group(1)
+    return algorithm is None or algorithm in _CHECKSUM_ALGORITHMS
 
 
 def matches_checksum(file_path: Path, hash: str) -> bool:
-    """Check if a file matches a given hash."""
-    return generate_checksum(file_path) == hash
+    """
+    Check if a file matches a given hash, as generated by
+    :func:`generate_checksum`.
+    """
+    algorithm, digest = parse_checksum(hash)
+    return parse_checksum(generate_checksum(file_path, algorithm))[1] == digest
 
 
 T = TypeVar("T")
@@ -85,15 +221,21 @@ class LazyMapping(Mapping[T, Y]):
         loader: Callable[[T], Y],
     ):
         self._keys = keys
+        # keys are checked for membership on every (first) access
+        self._key_set = frozenset(keys)
         self.loader = loader
         self._mapping = {}
 
     def __getitem__(self, key: T) -> Y:
-        if key not in self._keys:
+        # fast path: a single lookup for values that have already been loaded
+        try:
+            return self._mapping[key]
+        except KeyError:
+            pass
+        if key not in self._key_set:
             raise KeyError(key)
-        if key not in self._mapping:
-            self._mapping[key] = self.loader(key)
-        return self._mapping[key]
+        value = self._mapping[key] = self.loader(key)
+        return value
 
     def keys(self):
         return KeysView(self)
@@ -102,7 +244,7 @@ class LazyMapping(Mapping[T, Y]):
         return iter(self._keys)
 
     def __contains__(self, key: object) -> bool:
-        return key in self._keys
+        return key in self._key_set
 
     def __repr__(self) -> str:
         return f"LazyMapping(keys={self._keys})"
@@ -123,21 +265,27 @@ class UnknownDatasetException(Exception):
 
 def union(things: Iterable[Iterable]):
     """Get the set union of a list of iterables."""
-    return set.union(*map(set, things), set())
+    # set.union accepts arbitrary iterables: no need to build a set for each
+    return set().union(*things)
 
 
 def intersect(things: Iterable[Iterable]):
     """Get the set intersection of a list of iterables."""
-    sets = list(map(set, things))
-    if not sets:
-        return set()
-    return set.intersection(*sets)
+    # reduce into a single set as we go, rather than first building (and
+    # holding on to) a set for every iterable
+    things = iter(things)
+    result = set(next(things, ()))
+    for thing in things:
+        if not result:
+            break
+        result.intersection_update(thing)
+    return result
 
 
 def lpad(thing: str, length: int = 4, fill: str = " "):
     """Left pad a string with a given fill character."""
-    sep = f"{fill * length}"
-    return sep + thing.replace("\n", f"\n{sep}")
+    sep = fill * length
+    return sep + thing.replace("\n", "\n" + sep)
 
 
 def random_split(
@@ -154,9 +302,10 @@ def random_split(
             "The sum of the splits cannot exceed the dataset size."
         )
 
-    cumulative_sum = np.cumsum(splits)
+    cumulative_sum = np.cumsum(splits).tolist()
 
-    idxs = np.random.RandomState(seed).permutation(len(things))
+    # indexing with python ints is much faster than with numpy scalars
+    idxs = np.random.RandomState(seed).permutation(len(things)).tolist()
     return [
         [things[x] for x in idxs[i:j]]
         for i, j in zip([0, *cumulative_sum], cumulative_sum)
@@ -170,11 +319,16 @@ def k_fold_split(
 ) -> tuple[list[T], list[T]]:
     assert 0 <= fold < k
 
-    idxs = np.arange(len(things))
-    idxs = np.roll(idxs, fold * len(things) // k)
-    n_test = len(things) // k
-    train, test = idxs[:-n_test], idxs[-n_test:]
-    return [things[i] for i in train], [things[i] for i in test]
+    # equivalent to rolling ``things`` forward by ``shift`` places, and taking
+    # the last ``n_test`` of them as the test set, but without any per-item
+    # indexing: the test set is a single contiguous (wrapped) slice
+    n = len(things)
+    shift = fold * n // k
+    n_test = n // k
+    rolled = list(things[n - shift :]) + list(things[: n - shift])
+    # (if n_test is 0, everything is used for testing)
+    n_train = n - n_test if n_test else 0
+    return rolled[:n_train], rolled[n_train:]
 
 
 def split_keeping_ratio(
@@ -184,7 +338,10 @@ def split_keeping_ratio(
 ):
     assert len(things_to_split) == len(group_ids)
 
-    # 1. separate into groups
+    # 1. separate into groups: hashing numpy scalars (e.g. from a dataset's
+    # .info) is much slower than hashing the equivalent python objects
+    if isinstance(group_ids, np.ndarray):
+        group_ids = group_ids.tolist()
     groups: dict[G, list[T]] = defaultdict(list)
     for thing, group_id in zip(things_to_split, group_ids):
         groups[group_id].append(thing)
@@ -205,8 +362,8 @@ def split_keeping_ratio(
 
 
 def choose_n(things: Sequence[Y], n: int, seed: int = 42) -> list[Y]:
-    idxs = np.random.RandomState(seed).permutation(len(things))
-    return [things[i] for i in idxs[:n]]
+    idxs = np.random.RandomState(seed).permutation(len(things))[:n].tolist()
+    return [things[i] for i in idxs]
 
 
 _default_error_msg = (
@@ -219,6 +376,10 @@ class FrozenDict(dict):
     A dictionary that raises an error when any modifications are attempted.
     """
 
+    # one of these is created per frozen structure: don't also give each an
+    # instance __dict__
+    __slots__ = ("error_msg",)
+
     def __init__(self, d: dict, error_msg: str = _default_error_msg):
         super().__init__(d)
         self.error_msg = error_msg
@@ -244,6 +405,11 @@ class FrozenDict(dict):
     def popitem(self):
         raise ValueError(self.error_msg)
 
+    def __reduce__(self):
+        # rebuild through __init__ (for any pickle protocol, and for copying),
+        # rather than by setting items on the frozen dict
+        return (type(self), (dict(self), self.error_msg))
+
 
 def freeze_dict(d: dict, error_msg: str = _default_error_msg) -> FrozenDict:
     return FrozenDict(d, error_msg)
@@ -269,17 +435,18 @@ def remove_calculator(atoms: Atoms) -> None:
     atoms.calc = None
     results = calc.results
 
-    mappings = {
-        "energy": atoms.info,
-        "forces": atoms.arrays,
-        "stress": atoms.info,
-    }
-    for key, result in results.items():
-        mapping = mappings.get(key, None)
-        if mapping is None:
+    # only these results are moved: look each up directly, rather than
+    # scanning every result the calculator holds
+    for key, mapping in (
+        ("energy", atoms.info),
+        ("forces", atoms.arrays),
+        ("stress", atoms.info),
+    ):
+        result = results.get(key)
+        if result is None:
             continue
 
-        value_in_mapping = mapping.get(key, None)
+        value_in_mapping = mapping.get(key)
 
         if value_in_mapping is not None and not matches(
             value_in_mapping, result
@@ -10,12 +10,23 @@ import numpy as np
 from ase import Atom, Atoms
 from ase.data import covalent_radii
 from ase.data.colors import jmol_colors
-from ase.neighborlist import natural_cutoffs, neighbor_list
-from IPython.core.display import HTML
 
 BOND_RADIUS = 0.17
 MIN_ATOM_RADIUS = BOND_RADIUS + 0.1
 
+# a single bond cylinder, formatted directly rather than built up element by
+# element: the same structure is repeated for every bond in the scene
+_BOND_TEMPLATE = (
+    '<transform translation="{tx} {ty} {tz}" '
+    'rotation="{ax}, {ay}, {az}, {ang}">'
+    "<shape><appearance>"
+    '<material diffuseColor="{col}"/>'
+    "</appearance>"
+    f'<cylinder radius="{BOND_RADIUS}" height="{{h}}"/>'
+    "</shape></transform>"
+)
+_JMOL_COLOURS = [" ".join(map(str, rgb)) for rgb in jmol_colors.tolist()]
+
 
 def view(
     atoms: Atoms,
@@ -61,6 +72,8 @@ def view(
         viz = view(ethanol, show_bonds=True)
         Path("ethanol.html").write_text(viz.data)
     """
+    from IPython.core.display import HTML
+
     scene = x3d_scene(atoms, show_bonds, width="300px", height="300px")
 
     if start_rotation is None:
@@ -249,56 +262,56 @@ def empty_element():
 
 
 def x3d_bonds(atoms: Atoms, scale: float = 1.0):
+    from ase.neighborlist import natural_cutoffs, neighbor_list
+
     # set pbc off so that we don't try to draw bonds across periodic boundaries
     atoms = atoms.copy()
     atoms.pbc = False
     i, j = neighbor_list("ij", atoms, cutoff=natural_cutoffs(atoms, mult=1.2))  # type: ignore
-    bond_index = list(zip(i.tolist(), j.tolist()))
-
-    return group([x3d_bond(atoms[a], atoms[b], scale) for a, b in bond_index])  # type: ignore
 
+    numbers = atoms.numbers
+    a, b = atoms.positions[i], atoms.positions[j]
 
-def atom_size(atom: Atom, scale: float = 1.0):
-    return max(covalent_radii[atom.number] * scale, MIN_ATOM_RADIUS)
-
-
-def x3d_bond(a: Atom, b: Atom, scale: float = 1.0):
-    # if same element: draw a single cylinder connecting the two
-    if a.number == b.number:
-        return cyclinder_between(a.position, b.position, appearance_for(a))
-
+    # if same element: draw a single cylinder connecting the two.
     # otherwise, draw two cylinders, one from each atom to a suitable
     # point in the middle, and coloured according the respective atoms
-    dist = np.linalg.norm(a.position - b.position)
-    r_a = atom_size(a, scale)
-    r_b = atom_size(b, scale)
+    mixed = numbers[i] != numbers[j]
+    dist = np.linalg.norm(b - a, axis=1, keepdims=True)
+    radii = np.maximum(covalent_radii[numbers] * scale, MIN_ATOM_RADIUS)
+    r_a, r_b = radii[i, None], radii[j, None]
     frac = r_a / dist + (0.5 * (dist - r_a - r_b)) / dist
-    halfway = a.position + frac * (b.position - a.position)
-
-    a_to_center = cyclinder_between(a.position, halfway, appearance_for(a))
-    center_to_b = cyclinder_between(halfway, b.position, appearance_for(b))
-
-    return group([a_to_center, center_to_b])
-
-
-def cyclinder_between(a, b, appearance):
-    halfway = (a + b) / 2
-
-    z = np.array([0, 1, 0])
-    v = b - a
-    d = np.linalg.norm(v)
-    v = v / d
-    angle = np.arccos(z.dot(v))
-    axis = np.cross(z, v)
-
-    cylinder = element(
-        "shape",
-        children=[
-            appearance,
-            element("cylinder", radius=f"{BOND_RADIUS}", height=f"{d}"),
-        ],
-    )
-    return translate(rotate(cylinder, *axis, angle), *halfway)  # type: ignore
+    halfway = a + frac * (b - a)
+
+    starts = np.concatenate((a, halfway[mixed]))
+    ends = np.concatenate((np.where(mixed[:, None], halfway, b), b[mixed]))
+    colours = np.concatenate((numbers[i], numbers[j][mixed]))
+
+    # keep both halves of a mixed bond next to each other
+    bond_idx = np.concatenate((np.arange(len(i)), np.flatnonzero(mixed)))
+    order = np.argsort(bond_idx, kind="stable")
+    starts, ends, colours = starts[order], ends[order], colours[order]
+
+    # rotate each (y-aligned) cylinder onto its bond vector, v:
+    # axis = y x v, angle = arccos(y . v)
+    centres = (starts + ends) / 2
+    v = ends - starts
+    heights = np.linalg.norm(v, axis=1)
+    v = v / heights[:, None]
+    angles = np.arccos(v[:, 1])
+
+    lines = []
+    for (tx, ty, tz), (vx, _, vz), angle, height, Z in zip(
+        centres.tolist(),
+        v.tolist(),
+        angles.tolist(),
+        heights.tolist(),
+        colours.tolist(),
+    ):
+        values = dict(tx=tx, ty=ty, tz=tz, ax=vz, ay=0.0, az=-vx, ang=angle)
+        values.update(col=_JMOL_COLOURS[Z], h=height)
+        lines.append(_BOND_TEMPLATE.format_map(values))
+
+    return ET.fromstring("<group>" + "".join(lines) + "</group>")
 
 
 def element(name, child=None, children=None, **attributes) -> ET.Element:
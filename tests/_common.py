@@ -0,0 +1,35 @@
+"""Helpers shared by the test modules and the test setup."""
+
+import contextlib
+import functools
+import os
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover (Windows)
+    fcntl = None
+
+
+@functools.lru_cache(maxsize=None)
+def _dataset_names(root) -> tuple:
+    """The sorted names of the (per-dataset) directories within ``root``."""
+    with os.scandir(root) as it:
+        return tuple(
+            sorted(e.name for e in it if e.is_dir(follow_symlinks=False))
+        )
+
+
+@contextlib.contextmanager
+def _exclusive(lock_path):
+    """
+    Hold an exclusive lock on ``lock_path``, so that concurrent test processes
+    (e.g. ``pytest -n auto`` workers) take turns to create shared files.
+    """
+    with open(lock_path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,248 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import load_atoms
+import pytest
+from load_atoms import load_dataset
+from load_atoms.atoms_dataset import AtomsDataset, LmdbAtomsDataset
+
+from ._common import _exclusive
+from .setup import (
+    AVAILABLE_DATASETS,
+    DATABASE_ROOT,
+    PROJECT_ROOT,
+    SETUP_LOCK,
+    TESTING_DIR,
+    dataset_lock,
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-network",
+        action="store_true",
+        default=False,
+        help="run tests that need internet access",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "network: needs internet access (enable with --run-network)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-network"):
+        return
+    skip_network = pytest.mark.skip(reason="needs --run-network")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+def _fast_copy(src, dst):
+    """
+    Copy ``src`` to ``dst`` without passing the bytes through Python.
+
+    A hardlink is used where possible (nothing is copied at all), falling back
+    to an in-kernel copy, and finally to a plain ``shutil.copyfile``.
+    """
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(dst)
+
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    size = os.stat(src).st_size
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            copied = 0
+            while copied < size:
+                if hasattr(os, "copy_file_range"):
+                    n = os.copy_file_range(
+                        fsrc.fileno(), fdst.fileno(), size - copied
+                    )
+                else:
+                    n = os.sendfile(
+                        fdst.fileno(), fsrc.fileno(), copied, size - copied
+                    )
+                if n == 0:
+                    break
+                copied += n
+    except (AttributeError, OSError):
+        shutil.copyfile(src, dst)
+
+
+def _copy_if_stale(src, dst):
+    """Copy ``src`` to ``dst``, unless ``dst`` is already up to date."""
+    s = os.stat(src)
+    try:
+        d = os.stat(dst)
+    except FileNotFoundError:
+        pass
+    else:
+        if d.st_size == s.st_size and d.st_mtime_ns >= s.st_mtime_ns:
+            return
+    _fast_copy(src, dst)
+
+
+def _link_tree(src, dst):
+    """Recursively stage ``src`` into ``dst``, hardlinking files if possible."""
+    os.makedirs(dst, exist_ok=True)
+    for entry in os.scandir(src):
+        _stage_entry(entry, os.path.join(dst, entry.name))
+
+
+def _stage_entry(entry, dst):
+    if entry.is_dir(follow_symlinks=False):
+        _link_tree(entry.path, dst)
+    else:
+        _copy_if_stale(entry.path, dst)
+
+
+def _stage_dataset(name):
+    src_dir = os.path.join(DATABASE_ROOT, name)
+    # copy over the folder if it doesn't exist
+    _copy_if_stale(
+        os.path.join(src_dir, f"{name}.yaml"),
+        os.path.join(TESTING_DIR, "database-entries", f"{name}.yaml"),
+    )
+    # simulate download by moving any non-yaml files to the temp folder
+    entries = [e for e in os.scandir(src_dir) if not e.name.endswith(".yaml")]
+    if not entries:
+        return
+    temp_dir = os.path.join(TESTING_DIR, "raw-downloads", name)
+    os.makedirs(temp_dir, exist_ok=True)
+    for entry in entries:
+        _stage_entry(entry, os.path.join(temp_dir, entry.name))
+
+
+def _file_listing(root, prefix=""):
+    """
+    The relative path, size and modification time of every file in ``root``:
+    unlike e.g. the newest modification time alone, this also changes when
+    files are deleted, or added with old modification times.
+    """
+    listing = []
+    for entry in os.scandir(root):
+        relative_path = prefix + entry.name
+        if entry.is_dir(follow_symlinks=False):
+            listing.extend(_file_listing(entry.path, relative_path + "/"))
+        else:
+            stat = entry.stat()
+            listing.append((relative_path, stat.st_size, stat.st_mtime_ns))
+    return sorted(listing)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def testing_datasets() -> Path:
+    """
+    Simulate downloading the database, by copying it across to TESTING_DIR.
+    """
+    TESTING_DIR.mkdir(exist_ok=True)
+
+    # written once staging has finished: later sessions (and other test
+    # processes) skip staging entirely unless the database, or load-atoms
+    # itself, has since changed
+    sentinel = TESTING_DIR / ".setup_v2"
+    key = hashlib.sha256(
+        json.dumps(
+            {
+                "files": _file_listing(DATABASE_ROOT),
+                "pkg_version": load_atoms.__version__,
+            }
+        ).encode()
+    ).hexdigest()
+    if sentinel.exists() and sentinel.read_text() == key:
+        return TESTING_DIR
+
+    with _exclusive(SETUP_LOCK):
+        if sentinel.exists() and sentinel.read_text() == key:
+            # another test process has just finished staging
+            return TESTING_DIR
+
+        (TESTING_DIR / "database-entries").mkdir(exist_ok=True)
+        # each dataset is independent, and staging is I/O bound
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(_stage_dataset, AVAILABLE_DATASETS))
+        sentinel.write_text(key)
+    return TESTING_DIR
+
+
+@pytest.fixture(scope="session")
+def gap17(testing_datasets) -> AtomsDataset:
+    with _exclusive(dataset_lock("C-GAP-17")):
+        return load_dataset("C-GAP-17", root=testing_datasets)
+
+
+@pytest.fixture(scope="session")
+def gap17_lmdb(gap17, testing_datasets) -> LmdbAtomsDataset:
+    path = testing_datasets / "gap17.lmdb"
+
+    # only (re-)build the LMDB copy if it is out of date
+    sentinel = testing_datasets / "gap17.lmdb.key"
+    key = hashlib.sha256(
+        (gap17.description.model_dump_json() + load_atoms.__version__).encode()
+    ).hexdigest()
+    with _exclusive(dataset_lock("gap17.lmdb")):
+        if not (
+            path.exists() and sentinel.exists() and sentinel.read_text() == key
+        ):
+            shutil.rmtree(path, ignore_errors=True)
+            LmdbAtomsDataset.save(
+                path=path,
+                structures=gap17,
+                description=gap17.description,
+            )
+            sentinel.write_text(key)
+
+    return LmdbAtomsDataset(path)
+
+
+class _StaticFileHandler(BaseHTTPRequestHandler):
+    """Serve the bytes in ``files`` by path, and a 404 for anything else."""
+
+    files: dict = {}
+
+    def do_GET(self):
+        body = self.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def local_http_server():
+    """
+    The base url of a local server that hosts this repo's README.md, to test
+    downloading without needing internet access.
+    """
+    _StaticFileHandler.files = {
+        "/README.md": (PROJECT_ROOT / "README.md").read_bytes()
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StaticFileHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
@@ -1,19 +1,54 @@
+import shutil
+
+import load_atoms.database.backend
+import load_atoms.database.internet
 import pytest
-from load_atoms.database.backend import load_dataset_by_id
-from load_atoms.utils import UnknownDatasetException
+from load_atoms.database.backend import BASE_GITHUB_URL, load_dataset_by_id
+from load_atoms.utils import UnknownDatasetException, generate_checksum
+
+from ..setup import DATABASE_ROOT
+
+
+def _download_from_local_database(
+    url, local_path, progress, algorithm="sha256", cancelled=None
+):
+    # serve files hosted in the database from this repo, rather than GitHub
+    prefix = BASE_GITHUB_URL + "/"
+    if not url.startswith(prefix):
+        raise ConnectionError(f"Refusing to download {url} during tests")
+    source = DATABASE_ROOT / url[len(prefix) :]
+    if local_path.is_dir():
+        local_path = local_path / source.name
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, local_path)
+    return generate_checksum(local_path, algorithm)
+
 
+@pytest.fixture
+def offline(monkeypatch):
+    for module in (load_atoms.database.backend, load_atoms.database.internet):
+        monkeypatch.setattr(module, "download", _download_from_local_database)
 
-# @pytest.mark.xfail
-def test_load_dataset(tmp_path):
-    dataset = load_dataset_by_id("C-GAP-17", tmp_path)
+
+def _check_load_dataset(root):
+    dataset = load_dataset_by_id("C-GAP-17", root)
     assert len(dataset) == 4530, "Incorrect number of structures"
     assert dataset.description is not None, "Dataset description is missing"
     assert dataset.description.name == "C-GAP-17", "Incorrect dataset name"
 
     assert (
-        tmp_path / "database-entries" / "C-GAP-17.yaml"
+        root / "database-entries" / "C-GAP-17.yaml"
     ).exists(), "Dataset description missing"
-    assert (tmp_path / "C-GAP-17.pkl").exists(), "Structures are missing"
+    assert (root / "C-GAP-17.pkl").exists(), "Structures are missing"
 
     with pytest.raises(UnknownDatasetException):
-        load_dataset_by_id("made_up_dataset", tmp_path)
+        load_dataset_by_id("made_up_dataset", root)
+
+
+def test_load_dataset(tmp_path, offline):
+    _check_load_dataset(tmp_path)
+
+
+@pytest.mark.network
+def test_load_dataset_from_github(tmp_path):
+    _check_load_dataset(tmp_path)
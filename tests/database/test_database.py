@@ -1,14 +1,28 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from load_atoms import load_dataset
 from load_atoms.database import DatabaseEntry
+from load_atoms.utils import matches_checksum
 
+from .._common import _exclusive
 from ..setup import (
     AVAILABLE_DATASETS,
     DATABASE_ROOT,
     PROJECT_ROOT,
     TESTING_DIR,
+    dataset_lock,
 )
 
+# pytest cache entry that maps "<path>:<size>:<mtime_ns>" to the hash that
+# file was last verified against, so that unchanged files are not re-hashed
+# on every test run
+_CHECKSUM_CACHE_KEY = "load_atoms/checksums"
+
+# list the docs folder once, rather than stat-ing it once per dataset
+_DOC_FILES = frozenset(os.listdir(PROJECT_ROOT / "docs/source/datasets"))
+
 
 @pytest.mark.parametrize("name", AVAILABLE_DATASETS, ids=AVAILABLE_DATASETS)
 def test_correctness(name):
@@ -29,11 +43,68 @@ def test_correctness(name):
         return
 
     # naive test that the dataset loads without error
-    load_dataset(name, root=TESTING_DIR)
+    with _exclusive(dataset_lock(name)):
+        load_dataset(name, root=TESTING_DIR)
 
 
 @pytest.mark.parametrize("name", AVAILABLE_DATASETS, ids=AVAILABLE_DATASETS)
 def test_docs_exist(name):
-    docs = PROJECT_ROOT / "docs/source/datasets"
+    assert f"{name}.rst" in _DOC_FILES, f"Missing docs for {name}"
+
+
+def _hosted_files():
+    # the files that are hosted in the database, alongside their importer's
+    # expected hash: each dataset's folder is listed once, with os.scandir
+    for name in AVAILABLE_DATASETS:
+        importer = __import__(
+            "load_atoms.database.importers."
+            + DatabaseEntry.importer_file_stem(name),
+            fromlist=["Importer"],
+        ).Importer
+        with os.scandir(DATABASE_ROOT / name) as it:
+            entries = {e.name: e for e in it}
+        for file in importer.files_to_download():
+            entry = entries.get(file.local_name)
+            if entry is not None:
+                yield entry, file.expected_hash
+
+
+@pytest.fixture(scope="session")
+def hashed_datasets(pytestconfig) -> dict:
+    """
+    Map each file hosted in the database to whether it matches its importer's
+    expected hash. Files not already verified in pytest's cache are hashed
+    concurrently (hashlib releases the GIL), in a single pass.
+    """
+    # the cache is unavailable when running with `-p no:cacheprovider`
+    cache = getattr(pytestconfig, "cache", None)
+    verified = cache.get(_CHECKSUM_CACHE_KEY, {}) if cache is not None else {}
+
+    results, to_hash = {}, []
+    for entry, expected_hash in _hosted_files():
+        stat = entry.stat()
+        key = f"{entry.path}:{stat.st_size}:{stat.st_mtime_ns}"
+        if verified.get(key) == expected_hash:
+            results[entry.path] = True
+        else:
+            to_hash.append((key, entry.path, expected_hash))
+
+    with ThreadPoolExecutor() as pool:
+        matches = pool.map(
+            matches_checksum,
+            [path for _, path, _ in to_hash],
+            [expected_hash for _, _, expected_hash in to_hash],
+        )
+        for (key, path, expected_hash), match in zip(to_hash, matches):
+            results[path] = match
+            if match:
+                verified[key] = expected_hash
+
+    if cache is not None:
+        cache.set(_CHECKSUM_CACHE_KEY, verified)
+    return results
+
 
-    assert (docs / f"{name}.rst").exists(), f"Missing docs for {name}"
+def test_checksums(hashed_datasets):
+    mismatched = [path for path, match in hashed_datasets.items() if not match]
+    assert not mismatched, f"Checksum mismatch for {mismatched}"
@@ -1,18 +1,32 @@
+import functools
+
 import pytest
+import yaml
 from load_atoms.database import DatabaseEntry
 from pydantic import ValidationError
 
 from ..setup import PROJECT_ROOT
 
 
+@functools.lru_cache(maxsize=None)
+def _correct_yaml_contents() -> dict:
+    correct_yaml_file = PROJECT_ROOT / "database" / "C-GAP-17" / "C-GAP-17.yaml"
+    return yaml.safe_load(correct_yaml_file.read_text())
+
+
 def get_correct_dictionary():
     """
     get a dictionary that passes validation
     """
 
-    correct_yaml_file = PROJECT_ROOT / "database" / "C-GAP-17" / "C-GAP-17.yaml"
+    # the raw yaml contents, rather than a validated and then re-dumped
+    # DatabaseEntry: a (shallow) copy suffices, since the tests only ever
+    # replace top-level keys
+    return dict(_correct_yaml_contents())
 
-    return DatabaseEntry.from_yaml_file(correct_yaml_file).model_dump()
+
+def test_correct_dictionary():
+    DatabaseEntry(**get_correct_dictionary())
 
 
 def test_incorrect_name():
@@ -38,3 +52,8 @@ def test_incorrect_citation():
     kwargs["citation"] = "this is not a bibtex string"
     with pytest.raises(ValidationError):
         DatabaseEntry(**kwargs)
+
+    # ... which must start with an entry type, e.g. "@article{"
+    kwargs["citation"] = "@ not bibtex }"
+    with pytest.raises(ValidationError):
+        DatabaseEntry(**kwargs)
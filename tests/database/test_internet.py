@@ -1,26 +1,134 @@
-import pytest
-from load_atoms.database.internet import download
-from load_atoms.progress import SilentProgress
+import threading
 
-RAW_GITHUB_URL = (
-    "https://raw.githubusercontent.com/jla-gardner/load-atoms/main/"
+import load_atoms.database.internet
+import pytest
+from load_atoms.database.internet import (
+    DownloadCancelled,
+    FileDownload,
+    download,
+    download_all,
 )
+from load_atoms.progress import PrintedProgressBar, SilentProgress
+from load_atoms.utils import generate_checksum
+
+from ..setup import PROJECT_ROOT
+
+RAW_GITHUB_URL = "https://raw.githubusercontent.com/jla-gardner/load-atoms/main"
 
 _dummy_progress_bar = SilentProgress("dummy")
 
 
-def test_download(tmp_path):
-    url = RAW_GITHUB_URL + "README.md"
+def _check_download(base_url, tmp_path):
+    url = f"{base_url}/README.md"
     save_to = tmp_path / "test"
 
-    # check downloading to explicit file works:
-    download(url, save_to, _dummy_progress_bar)
+    # check downloading to explicit file works, and is hashed on the fly:
+    checksum = download(url, save_to, _dummy_progress_bar)
     assert save_to.exists()
+    assert checksum == generate_checksum(save_to)
 
     # check downloading to directory works:
     download(url, tmp_path, _dummy_progress_bar)
     assert (tmp_path / "README.md").exists()
 
-    fake_url = RAW_GITHUB_URL + "fake-file.txt"
+    fake_url = f"{base_url}/fake-file.txt"
     with pytest.raises(Exception):
         download(fake_url, save_to, _dummy_progress_bar)
+    # a failed request leaves an existing file untouched
+    assert save_to.exists()
+
+
+def test_download(tmp_path, local_http_server):
+    _check_download(local_http_server, tmp_path)
+
+
+def test_download_all(tmp_path, local_http_server):
+    url = f"{local_http_server}/README.md"
+    expected_hash = generate_checksum(PROJECT_ROOT / "README.md")
+    files = [
+        FileDownload(url=url, expected_hash=expected_hash, local_name=name)
+        for name in ["a.md", "b.md", "c.md"]
+    ]
+
+    download_all(files, tmp_path, _dummy_progress_bar)
+    for name in ["a.md", "b.md", "c.md"]:
+        assert (tmp_path / name).exists()
+
+    # any failed download should be raised
+    files.append(
+        FileDownload(
+            url=f"{local_http_server}/fake-file.txt",
+            expected_hash=expected_hash,
+        )
+    )
+    with pytest.raises(Exception):
+        download_all(files, tmp_path, _dummy_progress_bar)
+
+
+def test_cancelled_download(tmp_path, local_http_server):
+    cancelled = threading.Event()
+    cancelled.set()
+    with pytest.raises(DownloadCancelled):
+        download(
+            f"{local_http_server}/README.md",
+            tmp_path,
+            _dummy_progress_bar,
+            cancelled=cancelled,
+        )
+    # no partial file is left behind
+    assert not (tmp_path / "README.md").exists()
+
+
+def test_download_all_stops_on_failure(tmp_path, monkeypatch):
+    stopped = threading.Event()
+
+    def fake_download(url, local_path, progress, algorithm, cancelled=None):
+        if url.endswith("bad"):
+            raise ConnectionError(url)
+        # a "slow" download, that should be told to stop
+        assert cancelled is not None
+        if cancelled.wait(timeout=10):
+            stopped.set()
+            raise DownloadCancelled(url)
+        return "0" * 12
+
+    monkeypatch.setattr(load_atoms.database.internet, "download", fake_download)
+    files = [
+        FileDownload(url=f"https://example.com/{name}", expected_hash="0" * 12)
+        for name in ["slow", "bad"]
+    ]
+    with pytest.raises(ConnectionError):
+        download_all(files, tmp_path, _dummy_progress_bar)
+    assert stopped.wait(timeout=5)
+
+
+def test_printed_downloads_are_serial(tmp_path, monkeypatch):
+    threads = set()
+
+    def fake_download(url, local_path, progress, algorithm, cancelled=None):
+        threads.add(threading.get_ident())
+        local_path.write_text("")
+        return "0" * 12
+
+    monkeypatch.setattr(load_atoms.database.internet, "download", fake_download)
+    files = [
+        FileDownload(url=f"https://example.com/{name}", expected_hash="0" * 12)
+        for name in ["a", "b", "c"]
+    ]
+    download_all(files, tmp_path, PrintedProgressBar("test"))
+    assert threads == {threading.get_ident()}
+
+
+def test_invalid_expected_hash():
+    with pytest.raises(ValueError, match="Invalid expected hash"):
+        FileDownload(url=f"{RAW_GITHUB_URL}/README.md", expected_hash="abc")
+    with pytest.raises(ValueError, match="Invalid expected hash"):
+        FileDownload(
+            url=f"{RAW_GITHUB_URL}/README.md",
+            expected_hash="blake3:0123456789ab",
+        )
+
+
+@pytest.mark.network
+def test_download_from_github(tmp_path):
+    _check_download(RAW_GITHUB_URL, tmp_path)
@@ -1,7 +1,9 @@
 """
-Set up the test environment by copying across the database to 
-a `testing-datasets` folder and simulating a download by moving
-all non-yaml files to a `temp` folder.
+Paths shared by the tests, and the datasets available in the database.
+
+The `testing-datasets` folder is populated (by copying across the database and
+simulating a download of all non-yaml files) by the session-scoped
+``testing_datasets`` fixture in `tests/conftest.py`.
 
 See this SO answer for why this __init__ structure, and corresponding
     [tool.pytest]
@@ -10,34 +12,24 @@ in `pyproject.toml` is necessary:
 https://stackoverflow.com/a/46976704
 """
 
-import shutil
 from pathlib import Path
 
+from .._common import _dataset_names
+
 # this file is at root/tests/setup/__init__.py
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATABASE_ROOT = PROJECT_ROOT / "database"
-AVAILABLE_DATASETS = sorted(
-    [p.stem for p in sorted(DATABASE_ROOT.glob("**/*.yaml"))]
-)
+AVAILABLE_DATASETS = list(_dataset_names(DATABASE_ROOT))
 print(f"Available datasets: {AVAILABLE_DATASETS}")
 
-# simulate downloading the datasets
 TESTING_DIR = PROJECT_ROOT / "testing-datasets"
-TESTING_DIR.mkdir(exist_ok=True)
-
-(TESTING_DIR / "database-entries").mkdir(exist_ok=True)
-for name in AVAILABLE_DATASETS:
-    # copy over the folder if it doesn't exist
-    shutil.copy(
-        DATABASE_ROOT / name / f"{name}.yaml",
-        TESTING_DIR / "database-entries" / f"{name}.yaml",
-    )
-    # simulate download by moving any non-yaml files to the temp folder
-    for file in (DATABASE_ROOT / name).glob("*"):
-        if file.suffix == ".yaml":
-            continue
-        # copy file
-        relative_path = file.relative_to(DATABASE_ROOT / name)
-        temp_folder = TESTING_DIR / "raw-downloads" / name
-        temp_folder.mkdir(exist_ok=True, parents=True)
-        shutil.copy(file, temp_folder / relative_path)
+SETUP_LOCK = TESTING_DIR / ".lock"
+
+
+def dataset_lock(name: str) -> Path:
+    """
+    The lock to hold while loading (and so perhaps processing and caching)
+    dataset ``name`` into TESTING_DIR: one per dataset, so that different
+    datasets can be loaded by different test processes at the same time.
+    """
+    return TESTING_DIR / f".{name}.lock"
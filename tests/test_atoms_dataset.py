@@ -1,12 +1,11 @@
+import io
 import pickle
-import shutil
 from contextlib import nullcontext
 from pathlib import Path
 
 import numpy as np
 import pytest
 from ase import Atoms
-from ase.io import read, write
 from load_atoms import load_dataset
 from load_atoms.atoms_dataset import (
     AtomsDataset,
@@ -15,18 +14,46 @@ from load_atoms.atoms_dataset import (
 )
 from load_atoms.utils import UnknownDatasetException
 
-from .setup import TESTING_DIR
+# run a test against both the in-memory and LMDB versions of C-GAP-17
+both_gap17_datasets = pytest.mark.parametrize(
+    "dataset", ["gap17", "gap17_lmdb"], indirect=True
+)
 
-STRUCTURES = [Atoms("H2O"), Atoms("H2O2")]
-GAP17 = load_dataset("C-GAP-17", root=TESTING_DIR)
 
-shutil.rmtree(TESTING_DIR / "gap17.lmdb", ignore_errors=True)
-LmdbAtomsDataset.save(
-    path=TESTING_DIR / "gap17.lmdb",
-    structures=GAP17,
-    description=GAP17.description,
-)
-GAP17_LMDB = LmdbAtomsDataset(TESTING_DIR / "gap17.lmdb")
+@pytest.fixture(scope="session")
+def structures():
+    return [Atoms("H2O"), Atoms("H2O2")]
+
+
+@pytest.fixture(scope="module")
+def water_ds(structures) -> AtomsDataset:
+    return load_dataset(structures)
+
+
+@pytest.fixture
+def dataset(request) -> AtomsDataset:
+    return request.getfixturevalue(request.param)
+
+
+@pytest.fixture(scope="session")
+def gap17_columns(gap17) -> dict:
+    """
+    The per-structure properties of C-GAP-17 that the tests below compare
+    against, gathered once per session (the LMDB version holds identical
+    structures, so these apply to both).
+    """
+    return {
+        "config_type": np.asarray(gap17.info["config_type"]),
+        "energy": np.asarray(gap17.info["energy"]),
+        "id": _get_ids(gap17),
+    }
+
+
+def _slow_access_warning(dataset: AtomsDataset):
+    """LMDB datasets warn when .info and .arrays are accessed."""
+    if isinstance(dataset, LmdbAtomsDataset):
+        return pytest.warns(UserWarning)
+    return nullcontext()
 
 
 def _is_water_dataset(dataset):
@@ -34,34 +61,42 @@ def _is_water_dataset(dataset):
     assert set(dataset[0].symbols) == {"H", "O"}
 
 
-def test_dataset_from_structures():
-    dataset = load_dataset(STRUCTURES)
-    _is_water_dataset(dataset)
+def test_dataset_from_structures(water_ds):
+    _is_water_dataset(water_ds)
+
 
+def test_dataset_writeable_and_readable(water_ds):
+    from ase.io import read, write
 
-def test_dataset_writeable_and_readable(tmp_path):
-    dataset = load_dataset(STRUCTURES)
-    write(tmp_path / "test.xyz", dataset)
+    # round-trip in memory: there is no need to touch the disk here
+    buffer = io.StringIO()
+    write(buffer, water_ds, format="extxyz")
+    buffer.seek(0)
 
-    structures = read(tmp_path / "test.xyz", index=":")
-    assert isinstance(structures, list)
-    dataset2 = load_dataset(structures)
+    read_structures = read(buffer, index=":", format="extxyz")
+    assert isinstance(read_structures, list)
+    dataset2 = load_dataset(read_structures)
     _is_water_dataset(dataset2)
 
-    dataset3 = load_dataset(tmp_path / "test.xyz")
-    _is_water_dataset(dataset3)
+
+def test_dataset_loadable_from_file(tmp_path, water_ds):
+    from ase.io import write
+
+    write(tmp_path / "test.xyz", water_ds)
+    dataset = load_dataset(tmp_path / "test.xyz")
+    _is_water_dataset(dataset)
 
 
 @pytest.mark.filterwarnings("ignore:Creating a dataset with a single structure")
-def test_indexing():
-    dataset = load_dataset(STRUCTURES)
+def test_indexing(structures, water_ds):
+    dataset = water_ds
 
     structure = dataset[0]
     assert isinstance(
         structure, Atoms
     ), "Indexing should return an Atoms object"
     assert (
-        structure is STRUCTURES[0]
+        structure is structures[0]
     ), "Indexing should return the same structure"
 
     sub_dataset = dataset[1:]
@@ -90,6 +125,15 @@ def test_indexing():
         len(sub_dataset) == 1
     ), "Indexing should return the correct number of structures"
 
+    indices = [False, True]
+    sub_dataset = dataset[indices]
+    assert isinstance(
+        sub_dataset, AtomsDataset
+    ), "Indexing should return a dataset"
+    assert (
+        len(sub_dataset) == 1
+    ), "Indexing should return the correct number of structures"
+
     indices = [0, 1, 1]
     sub_dataset = dataset[indices]
     assert isinstance(
@@ -100,9 +144,7 @@ def test_indexing():
     ), "Indexing should return the correct number of structures"
 
 
-@pytest.mark.parametrize(
-    "dataset", [GAP17, GAP17_LMDB], ids=["gap17", "gap17_lmdb"]
-)
+@both_gap17_datasets
 def test_can_load_from_id(tmp_path, dataset):
     assert len(dataset) == 4530
 
@@ -110,11 +152,9 @@ def test_can_load_from_id(tmp_path, dataset):
         load_dataset("made_up_dataset", root=tmp_path)
 
 
-@pytest.mark.parametrize(
-    "dataset", [GAP17, GAP17_LMDB], ids=["gap17", "gap17_lmdb"]
-)
-def test_summarise(dataset):
-    summary = summarise_dataset(STRUCTURES)
+@both_gap17_datasets
+def test_summarise(dataset, structures):
+    summary = summarise_dataset(structures)
     assert summary.startswith(
         "Dataset"
     ), "Unknown datasets should start like this"
@@ -126,8 +166,8 @@ def test_summarise(dataset):
     ), "The summary should contain the dataset name"
 
 
-def test_appears_equal():
-    assert str(GAP17) == str(GAP17_LMDB)
+def test_appears_equal(gap17, gap17_lmdb):
+    assert str(gap17) == str(gap17_lmdb)
 
 
 def test_useful_error_message():
@@ -145,6 +185,8 @@ def test_useful_error_message():
 
 
 def test_useful_warning(tmp_path):
+    from ase.io import write
+
     structure = Atoms("H2O")
     write(tmp_path / "test.xyz", structure)
 
@@ -155,11 +197,9 @@ def test_useful_warning(tmp_path):
         load_dataset(tmp_path / "test.xyz")
 
 
-@pytest.mark.parametrize(
-    "dataset", [GAP17, GAP17_LMDB], ids=["gap17", "gap17_lmdb"]
-)
+@both_gap17_datasets
 def test_info_and_arrays(dataset):
-    context = nullcontext() if dataset is GAP17 else pytest.warns(UserWarning)
+    context = _slow_access_warning(dataset)
     with context:
         assert "energy" in dataset.info
         assert isinstance(dataset.info["energy"], np.ndarray)
@@ -169,22 +209,21 @@ def test_info_and_arrays(dataset):
         assert dataset.arrays["positions"].shape[-1] == 3
 
 
-def test_properties():
-    dataset = load_dataset(STRUCTURES)
+def test_properties(water_ds):
+    dataset = water_ds
 
     assert len(dataset) == 2
     assert dataset.n_atoms == 7
     assert (dataset.structure_sizes == [3, 4]).all()
 
 
-def _get_proportion(config_type, dataset):
-    return np.sum(dataset.info["config_type"] == config_type) / len(dataset)
+def _get_proportion(config_type, config_types):
+    return np.mean(np.asarray(config_types) == config_type)
 
 
-@pytest.mark.parametrize(
-    "dataset", [GAP17, GAP17_LMDB], ids=["gap17", "gap17_lmdb"]
-)
-def test_random_split(dataset):
+@both_gap17_datasets
+@pytest.mark.filterwarnings("ignore:LmdbAtomsDatasets do not hold")
+def test_random_split(dataset, gap17_columns):
     # request integer splits
     train, test = dataset.random_split([100, 50])
     assert len(train) == 100
@@ -198,7 +237,7 @@ def test_random_split(dataset):
     assert len(c) in [n // 4, n // 4 + 1]
 
     # test keep ratio
-    context = nullcontext() if dataset is GAP17 else pytest.warns(UserWarning)
+    context = _slow_access_warning(dataset)
     with context:
         assert "config_type" in dataset.info
         assert "bulk_amo" in dataset.info["config_type"]
@@ -207,14 +246,15 @@ def test_random_split(dataset):
         a, b = dataset.random_split([0.5, 0.5], keep_ratio="config_type")
         assert len(a) + len(b) == len(dataset)
         assert np.isclose(
-            _get_proportion("bulk_amo", a), _get_proportion("bulk_amo", dataset)
+            _get_proportion("bulk_amo", a.info["config_type"]),
+            _get_proportion("bulk_amo", gap17_columns["config_type"]),
         )
 
         # ... with ints
         a, b = dataset.random_split([500, 500], keep_ratio="config_type")
         assert np.isclose(
-            _get_proportion("bulk_amo", a),
-            _get_proportion("bulk_amo", dataset),
+            _get_proportion("bulk_amo", a.info["config_type"]),
+            _get_proportion("bulk_amo", gap17_columns["config_type"]),
             atol=0.01,
         )
         assert len(a) == len(b) == 500
@@ -225,49 +265,58 @@ def test_random_split(dataset):
         dataset.random_split([0.5, 0.5], keep_ratio="made_up")
 
 
-@pytest.mark.parametrize(
-    "dataset", [GAP17, GAP17_LMDB], ids=["gap17", "gap17_lmdb"]
-)
-def test_k_fold_split(dataset):
+def _get_ids(dataset):
+    # atoms are not hashable, so we use a unique id for each structure
+    return np.array(
+        [
+            s.info["energy"] + np.abs(s.arrays["forces"]).sum()
+            for s in dataset
+        ],
+        dtype=np.float64,
+    )
+
+
+@both_gap17_datasets
+@pytest.mark.filterwarnings("ignore:LmdbAtomsDatasets do not hold")
+def test_k_fold_split(dataset, gap17_columns):
     # error messages
     with pytest.raises(ValueError, match="k must be at least 2"):
         dataset.k_fold_split(k=1)
 
-    # atoms are not hashable, so we set a unique id for each structure
-    def get_id(structure):
-        return float(
-            structure.info["energy"] + np.abs(structure.arrays["forces"]).sum()
-        )
-
     a, b = dataset.k_fold_split(5, fold=0, shuffle=False)
     assert a[0] == dataset[0]
 
     a, b = dataset.k_fold_split(5, fold=0)
     assert len(a) == 3624
     assert len(b) == 906
-    a_ids = set(map(get_id, a))
-    b_ids = set(map(get_id, b))
-    assert a_ids & b_ids == set()
+    a_ids = _get_ids(a)
+    b_ids = _get_ids(b)
+    # ids are unique within a split, so numpy can skip de-duplicating them
+    assert len(np.unique(a_ids)) == len(a_ids)
+    assert len(np.unique(b_ids)) == len(b_ids)
+    assert np.intersect1d(a_ids, b_ids, assume_unique=True).size == 0
 
     c, d = dataset.k_fold_split(5, fold=1)
-    c_ids = set(map(get_id, c))
+    c_ids = _get_ids(c)
+    assert len(np.unique(c_ids)) == len(c_ids)
     # ensure that b is completely within c
-    assert b_ids <= c_ids
+    assert np.isin(b_ids, c_ids, assume_unique=True).all()
 
     # ensure that the folds completely cover the dataset
-    all_test_ids = []
-    for i in range(5):
-        _, test = dataset.k_fold_split(5, fold=i)
-        all_test_ids.extend(list(map(get_id, test)))
-
-    assert len(set(all_test_ids)) == len(dataset)
+    all_test_ids = [
+        _get_ids(dataset.k_fold_split(5, fold=i)[1]) for i in range(5)
+    ]
+    assert np.array_equal(
+        np.sort(np.concatenate(all_test_ids)), np.sort(gap17_columns["id"])
+    )
 
     # test keep ratio
     a, b = dataset.k_fold_split(k=5, fold=0, keep_ratio="config_type")
-    context = nullcontext() if dataset is GAP17 else pytest.warns(UserWarning)
+    context = _slow_access_warning(dataset)
     with context:
         assert np.isclose(
-            _get_proportion("bulk_amo", a), _get_proportion("bulk_amo", dataset)
+            _get_proportion("bulk_amo", a.info["config_type"]),
+            _get_proportion("bulk_amo", gap17_columns["config_type"]),
         )
 
     # test error
@@ -279,8 +328,8 @@ def test_k_fold_split(dataset):
         dataset.k_fold_split(5, fold=0, keep_ratio="config_type", shuffle=False)
 
 
-def test_read_only():
-    dataset = GAP17_LMDB
+def test_read_only(gap17_lmdb):
+    dataset = gap17_lmdb
     atoms = dataset[0]
     with pytest.raises(ValueError, match="info"):
         atoms.info["test"] = 1
@@ -288,36 +337,34 @@ def test_read_only():
         atoms.arrays["test"] = np.zeros((1, 3))
 
 
-@pytest.mark.parametrize(
-    "dataset", [GAP17, GAP17_LMDB], ids=["gap17", "gap17_lmdb"]
-)
-def test_filtering(dataset: AtomsDataset):
+@both_gap17_datasets
+@pytest.mark.filterwarnings("ignore:LmdbAtomsDatasets do not hold")
+def test_filtering(dataset: AtomsDataset, gap17_columns):
     assert len(dataset) == 4530
 
     # filter out all but the first 10 structures
     filtered = dataset.filter_by(config_type="bulk_amo")
     assert len(filtered) == 3410
 
-    bool_idx = [
-        structure.info["config_type"] == "bulk_amo" for structure in dataset
-    ]
+    bool_idx = gap17_columns["config_type"] == "bulk_amo"
     indexed = dataset[bool_idx]
     assert len(indexed) == 3410
-    context = nullcontext() if dataset is GAP17 else pytest.warns(UserWarning)
+    context = _slow_access_warning(dataset)
     with context:
         assert np.all(indexed.info["energy"] == filtered.info["energy"])
+    assert np.all(filtered.info["energy"] == gap17_columns["energy"][bool_idx])
 
 
-def test_pickleable():
-    dataset = GAP17
+def test_pickleable(gap17):
+    dataset = gap17
     dump = pickle.dumps(dataset)
     assert dump
     load = pickle.loads(dump)
     assert load[0] == dataset[0]
 
 
-def test_write(tmp_path):
-    dataset = GAP17[:5]
+def test_write(tmp_path, gap17):
+    dataset = gap17[:5]
     dataset.write(tmp_path / "test.xyz")
     dataset2 = load_dataset(tmp_path / "test.xyz")
     assert len(dataset2) == len(dataset)
@@ -8,31 +8,37 @@ from load_atoms.utils import remove_calculator
 
 from .setup import DATABASE_ROOT
 
+GAP17_EXTXYZ = DATABASE_ROOT / "C-GAP-17" / "C-GAP-17.extxyz"
 
-def test_remove_calculator():
-    structures = ase.io.read(
-        DATABASE_ROOT / "C-GAP-17" / "C-GAP-17.extxyz",
-        index=":",
-    )
-    assert isinstance(structures, list)
+
+@pytest.fixture(scope="module")
+def gap17_from_file():
+    # parsing the whole file is slow: only do so once for this module
+    return load_dataset(GAP17_EXTXYZ)
+
+
+def test_remove_calculator(gap17_from_file):
+    # only the first structure is needed: avoid parsing the whole file
+    structure = ase.io.read(GAP17_EXTXYZ, index=0)
+    assert isinstance(structure, Atoms)
 
     # test ase.io.read behaviour
-    assert isinstance(structures[0].calc, SinglePointCalculator)
-    assert "energy" in structures[0].calc.results
-    assert "energy" not in structures[0].info
-    assert "forces" not in structures[0].arrays
+    assert isinstance(structure.calc, SinglePointCalculator)
+    assert "energy" in structure.calc.results
+    assert "energy" not in structure.info
+    assert "forces" not in structure.arrays
 
     # test remove_calculator
-    remove_calculator(structures[0])
-    assert structures[0].calc is None
-    assert "energy" in structures[0].info
-    assert "forces" in structures[0].arrays
+    remove_calculator(structure)
+    assert structure.calc is None
+    assert "energy" in structure.info
+    assert "forces" in structure.arrays
 
     # test load_dataset behaviour
-    dataset = load_dataset(DATABASE_ROOT / "C-GAP-17" / "C-GAP-17.extxyz")
+    dataset = gap17_from_file
     assert dataset[0].calc is None
     assert "energy" in dataset.info
-    assert dataset.info["energy"][0] == structures[0].info["energy"]
+    assert dataset.info["energy"][0] == structure.info["energy"]
     assert "forces" in dataset.arrays
 
     # test clash
@@ -1,9 +1,17 @@
+import hashlib
+import copy
+import mmap
+import os
+import pickle
+
 import pytest
 from load_atoms.utils import (
     LazyMapping,
+    _cached_checksum,
     freeze_dict,
     generate_checksum,
     intersect,
+    is_valid_checksum,
     k_fold_split,
     lpad,
     matches_checksum,
@@ -29,16 +37,75 @@ def test_matches_contents(tmp_path):
     assert not matches_checksum(fake_file, incorrect_hash)
     assert not matches_checksum(fake_file, correct_hash[:-1])
 
+    # checksums using other algorithms are tagged
+    blake2b_hash = generate_checksum(fake_file, algorithm="blake2b")
+    assert blake2b_hash.startswith("blake2b:")
+    assert matches_checksum(fake_file, blake2b_hash)
+    assert not matches_checksum(fake_file, "blake2b:" + correct_hash)
+
+
+def test_checksum_tracks_changes(tmp_path):
+    fake_file = tmp_path / "file.txt"
+    fake_file.write_text("fake file")
+    first_hash = generate_checksum(fake_file)
+
+    # checksums are cached, but not once the file has changed: use content of
+    # the same size, so that only the modification time tells them apart
+    stat = fake_file.stat()
+    fake_file.write_text("fake fill")
+    os.utime(fake_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert fake_file.stat().st_size == stat.st_size
+    assert generate_checksum(fake_file) != first_hash
+    assert not matches_checksum(fake_file, first_hash)
+
+
+def test_is_valid_checksum(tmp_path):
+    fake_file = tmp_path / "file.txt"
+    fake_file.write_text("fake file")
+
+    assert is_valid_checksum(generate_checksum(fake_file))
+    assert is_valid_checksum(generate_checksum(fake_file, algorithm="sha3_256"))
+    assert is_valid_checksum("c9dcec505f4d")
+
+    assert not is_valid_checksum("0" * 17)  # too long
+    assert not is_valid_checksum("C9DCEC505F4D")  # not lower-case hex
+    assert not is_valid_checksum(":c9dcec505f4d")  # empty algorithm
+    assert not is_valid_checksum("blake3:0123456789ab")  # unknown algorithm
+    assert not is_valid_checksum("shake_128:0123456789ab")  # variable length
+    assert not is_valid_checksum(42)  # type: ignore
+
+
+def test_checksum_without_mmap(tmp_path, monkeypatch):
+    fake_file = tmp_path / "file.txt"
+    fake_file.write_text("fake file")
+    correct_hash = generate_checksum(fake_file)
+
+    def no_mmap(*args, **kwargs):
+        raise OSError("mmap not supported")
+
+    # files that can't be memory-mapped are read instead...
+    monkeypatch.setattr(mmap, "mmap", no_mmap)
+    _cached_checksum.cache_clear()
+    assert generate_checksum(fake_file) == correct_hash
+
+    # ... including on python < 3.11, where hashlib.file_digest doesn't exist
+    monkeypatch.delattr(hashlib, "file_digest", raising=False)
+    _cached_checksum.cache_clear()
+    assert generate_checksum(fake_file) == correct_hash
+
 
 def test_intersection():
     assert intersect([[1, 2, 3], [2, 3, 4]]) == {2, 3}
     assert intersect(("hi", "hello")) == {"h"}
     assert intersect([]) == set()
+    # generators, e.g. of dict keys, are consumed lazily
+    assert intersect(d.keys() for d in [{"a": 1, "b": 2}, {"b": 3}]) == {"b"}
 
 
 def test_union():
     assert union([[1, 2, 3], [2, 3, 4]]) == {1, 2, 3, 4}
     assert union(("hi", "hello")) == {"h", "e", "l", "o", "i"}
+    assert union([]) == set()
 
 
 def test_lazy_mapping():
@@ -185,3 +252,16 @@ def test_frozen_dict():
     assert list(fd.keys()) == list(d.keys())
     assert list(fd.values()) == list(d.values())
     assert list(fd.items()) == list(d.items())
+
+    # frozen dicts can be pickled (with any protocol) and copied
+    fd = freeze_dict(d, error_msg="custom message")
+    copies = [
+        pickle.loads(pickle.dumps(fd, protocol=protocol))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1)
+    ]
+    copies += [copy.copy(fd), copy.deepcopy(fd)]
+    for fd_copy in copies:
+        assert type(fd_copy) is type(fd)
+        assert fd_copy == fd
+        with pytest.raises(ValueError, match="custom message"):
+            fd_copy["a"] = 3